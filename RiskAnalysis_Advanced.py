@@ -6,61 +6,124 @@ import pandas as pd
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
+import hashlib
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from risk_kernels import rolling_sharpe_kernel
+
+CACHE_DIR = "cache"
+CACHE_TTL_SECONDS = 24 * 60 * 60  # one trading day
+
+def download_prices(tickers, start, end):
+    """Fetch closing prices for tickers, with an on-disk parquet cache.
+
+    The cache is keyed by (sorted tickers, date range) and considered
+    fresh for CACHE_TTL_SECONDS; a hit skips the network entirely.
+    """
+    key = hashlib.md5(",".join(sorted(tickers) + [start, end]).encode()).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, f"prices_{key}.parquet")
+
+    if os.path.exists(cache_path) and (time.time() - os.path.getmtime(cache_path)) < CACHE_TTL_SECONDS:
+        return pd.read_parquet(cache_path)
+
+    prices = yf.download(tickers, start=start, end=end, progress=False, threads=True, group_by='column')['Close']
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    prices.to_parquet(cache_path)
+    return prices
 
 def generate_report():
     # ----------------------------------------------------------
     # 1. Data Download
     # ----------------------------------------------------------
     tickers = ['AAPL', 'MSFT', 'TSLA', 'AMZN', 'JPM']
-    data = yf.download(tickers, start='2020-01-01', end='2025-01-01', progress=False)['Close']
+    all_syms = tickers + ['^GSPC']
+    prices = download_prices(all_syms, '2020-01-01', '2025-01-01')
+
+    # Everything below is a pure function of the prices, so if their
+    # content hash matches the last export there is nothing to redo.
+    price_hash = hashlib.md5(prices.to_numpy().tobytes()).hexdigest()
+    hash_path = "reports/.hash"
+    if os.path.exists(hash_path):
+        with open(hash_path) as f:
+            if f.read().strip() == price_hash:
+                print("✅ Report already up to date — prices unchanged")
+                return
+
+    # Drop any row with a missing close (yfinance data gaps, calendar
+    # mismatches in the shared frame) before splitting: the ndarray
+    # path below has no NaN handling, and one NaN return would poison
+    # cumprod and everything derived from it.
+    prices = prices.dropna()
+    data = prices[tickers]
+    benchmark = prices['^GSPC']
 
     weights = {'AAPL': 0.25, 'MSFT': 0.25, 'TSLA': 0.2, 'AMZN': 0.2, 'JPM': 0.1}
 
     # ----------------------------------------------------------
-    # 2. Portfolio Calculations
+    # 2. Portfolio Calculations (numpy hot path)
     # ----------------------------------------------------------
-    returns = data.pct_change().dropna()
-    portfolio_returns = (returns * list(weights.values())).sum(axis=1)
+    # Everything downstream works on contiguous float64 arrays; the
+    # DatetimeIndex is reattached only at the export boundary.
+    ret_index = data.index[1:]
+    arr = data.to_numpy(dtype=np.float64)
+    ret = np.diff(arr, axis=0) / arr[:-1]
+
+    w = np.array([weights[t] for t in data.columns], dtype=np.float64)
+    port_ret = ret @ w
 
     initial_investment = 100000
-    portfolio_value = initial_investment * (1 + portfolio_returns).cumprod()
-    portfolio_pnl = portfolio_value - initial_investment
+    pv_arr = initial_investment * np.cumprod(1.0 + port_ret)
+    total_pnl = pv_arr[-1] - initial_investment
+
+    # CAGR from actual elapsed trading days, not a hard-coded 5 years
+    n_years = pv_arr.shape[0] / 252.0
+    cagr = (pv_arr[-1] / initial_investment) ** (1.0 / n_years) - 1.0
 
-    # Annualized risk metrics
-    volatility = portfolio_returns.std() * np.sqrt(252)
-    sharpe_ratio = ((portfolio_returns.mean() * 252) - 0.02) / volatility
+    # Annualized risk metrics (ddof=1 matches pandas' .std())
+    volatility = port_ret.std(ddof=1) * np.sqrt(252)
+    sharpe_ratio = ((port_ret.mean() * 252) - 0.02) / volatility
 
     # ----------------------------------------------------------
     # 3. Beta (vs S&P 500)
     # ----------------------------------------------------------
-    benchmark = yf.download('^GSPC', start='2020-01-01', end='2025-01-01', progress=False)['Close']
-    benchmark_returns = benchmark.pct_change().dropna()
-
-    aligned_portfolio, aligned_benchmark = portfolio_returns.align(benchmark_returns, join='inner')
-    aligned_portfolio = aligned_portfolio.to_numpy().flatten()
-    aligned_benchmark = aligned_benchmark.to_numpy().flatten()
-
-    cov_matrix = np.cov(np.vstack([aligned_portfolio, aligned_benchmark]))
-    beta = cov_matrix[0, 1] / cov_matrix[1, 1]
-
+    bench_arr = benchmark.to_numpy(dtype=np.float64)
+    bench_ret = np.diff(bench_arr) / bench_arr[:-1]
+
+    # Both return arrays come from one download and share the calendar
+    # (incomplete rows were dropped up front); the finite mask is a
+    # residual guard replacing the old inner-join align.
+    mask = np.isfinite(port_ret) & np.isfinite(bench_ret)
+    ap = port_ret[mask]
+    ab = bench_ret[mask]
+
+    # Closed-form OLS slope: Cov(p, b) / Var(b) via two dot products,
+    # without the vstack copy and 2x2 covariance matrix.
+    a = ap - ap.mean()
+    b = ab - ab.mean()
+    beta = (a @ b) / (b @ b)
 
     # ----------------------------------------------------------
     # 4. Maximum Drawdown
     # ----------------------------------------------------------
-    rolling_max = portfolio_value.cummax()
-    drawdown = (portfolio_value - rolling_max) / rolling_max
-    max_drawdown = drawdown.min()
+    rolling_max = np.maximum.accumulate(pv_arr)
+    drawdown_arr = pv_arr - rolling_max
+    np.divide(drawdown_arr, rolling_max, out=drawdown_arr)
+    max_drawdown = drawdown_arr.min()
 
     # ----------------------------------------------------------
     # 5. Rolling Sharpe Ratio
     # ----------------------------------------------------------
     window = 90
     risk_free_rate_daily = 0.02 / 252
-    rolling_sharpe = (
-        (portfolio_returns.rolling(window).mean() - risk_free_rate_daily)
-        / portfolio_returns.rolling(window).std()
-    ) * np.sqrt(252)
+    rolling_sharpe_arr = rolling_sharpe_kernel(port_ret, window, risk_free_rate_daily, np.sqrt(252))
+
+    # Back to labelled frames for the export boundary
+    returns = pd.DataFrame(ret, index=ret_index, columns=data.columns)
+    portfolio_value = pd.Series(pv_arr, index=ret_index)
+    drawdown = pd.Series(drawdown_arr, index=ret_index)
+    rolling_sharpe = pd.Series(rolling_sharpe_arr, index=ret_index)
 
     # ----------------------------------------------------------
     # 6. Save to Excel
@@ -79,9 +142,9 @@ def generate_report():
             'Maximum Drawdown'
         ],
         'Value': [
-            portfolio_value.iloc[-1],
-            portfolio_pnl.iloc[-1],
-            (portfolio_value.iloc[-1] / initial_investment) ** (1 / 5) - 1,
+            pv_arr[-1],
+            total_pnl,
+            cagr,
             volatility,
             sharpe_ratio,
             beta,
@@ -89,13 +152,38 @@ def generate_report():
         ]
     })
 
-    with pd.ExcelWriter(FILE_PATH) as writer:
-        portfolio_value.to_excel(writer, sheet_name='Portfolio Value')
-        returns.to_excel(writer, sheet_name='Daily Returns')
-        drawdown.to_excel(writer, sheet_name='Drawdown')
-        rolling_sharpe.to_excel(writer, sheet_name='Rolling Sharpe')
-        data.to_excel(writer, sheet_name='Price Data')
-        metrics.to_excel(writer, sheet_name='Summary Metrics', index=False)
+    frames = {
+        'Price Data': data,
+        'Daily Returns': returns,
+        'Portfolio Value': portfolio_value.to_frame('Portfolio Value'),
+        'Drawdown': drawdown.to_frame('Drawdown'),
+        'Rolling Sharpe': rolling_sharpe.to_frame('Rolling Sharpe'),
+        'Summary Metrics': metrics,
+    }
+
+    # Parquet is the interchange format the dashboard reads; the xlsx
+    # workbook is kept as a secondary artifact for humans. The writes
+    # are independent files and pyarrow releases the GIL, so a thread
+    # pool overlaps compression and disk I/O across sheets.
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        list(ex.map(
+            lambda kv: kv[1].to_parquet(f"reports/{kv[0]}.parquet", compression='zstd'),
+            frames.items(),
+        ))
+
+    # No constant_memory here: pandas emits cells column-major, which
+    # that mode would flush away row by row, leaving only the last row
+    # of each sheet. These frames are small enough not to need it.
+    writer_options = {
+        'strings_to_numbers': False,
+        'default_date_format': 'yyyy-mm-dd',
+    }
+    with pd.ExcelWriter(FILE_PATH, engine='xlsxwriter', engine_kwargs={'options': writer_options}) as writer:
+        for name, frame in frames.items():
+            frame.to_excel(writer, sheet_name=name, index=(name != 'Summary Metrics'))
+
+    with open(hash_path, "w") as f:
+        f.write(price_hash)
 
     print(f"✅ Export complete → {FILE_PATH}")
 
@@ -3,6 +3,7 @@
 # ==========================================================
 import streamlit as st
 import pandas as pd
+import numpy as np
 import datetime
 from importlib import reload
 import RiskAnalysis_Advanced as risk
@@ -38,16 +39,17 @@ with col2:
                 st.error(f"❌ Failed to refresh data: {e}")
 
 # ----------------------------------------------------------
-# 2. Load Excel data
+# 2. Load report data
 # ----------------------------------------------------------
-FILE_PATH = "reports/Portfolio_Analysis_Advanced.xlsx"
+REPORTS_DIR = "reports"
+SHEETS = ["Portfolio Value", "Daily Returns", "Drawdown", "Rolling Sharpe", "Price Data", "Summary Metrics"]
 
 @st.cache_data
-def load_excel(path):
-    return pd.read_excel(path, sheet_name=None)
+def load_report(directory):
+    return {name: pd.read_parquet(f"{directory}/{name}.parquet") for name in SHEETS}
 
 try:
-    data = load_excel(FILE_PATH)
+    data = load_report(REPORTS_DIR)
 except FileNotFoundError:
     st.warning("No report found yet. Click 🔄 **Refresh Data** to generate the first dataset.")
     st.stop()
@@ -62,6 +64,7 @@ price_data = data.get("Price Data")
 # ----------------------------------------------------------
 # 3. Clean function
 # ----------------------------------------------------------
+@st.cache_data(show_spinner=False)
 def clean_for_chart(df):
     df = df.copy()
     if "Unnamed: 0" in df.columns:
@@ -69,29 +72,44 @@ def clean_for_chart(df):
     if "Date" not in df.columns:
         df.reset_index(inplace=True)
         df.rename(columns={df.columns[0]: "Date"}, inplace=True)
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    # Parquet frames arrive with datetime64 already; only string dates
+    # (e.g. from an old xlsx export) need parsing, and we wrote those
+    # ourselves so the ISO fast path applies instead of dateutil inference.
+    if not pd.api.types.is_datetime64_any_dtype(df["Date"]):
+        df["Date"] = pd.to_datetime(df["Date"], format="ISO8601", errors="coerce", cache=True)
     df = df.set_index("Date")
     df = df.select_dtypes(include=["number"])
     df.columns = df.columns.map(str)
     return df.dropna()
 
+def slice_dates(df, start, end):
+    # Integer bounds from searchsorted on the sorted DatetimeIndex:
+    # no string re-parsing, and iloc returns a zero-copy view.
+    idx = df.index.values
+    lo = idx.searchsorted(np.datetime64(start))
+    hi = idx.searchsorted(np.datetime64(end), side="right")
+    return df.iloc[lo:hi]
+
+def downsample(df, max_points=2000):
+    # Screen resolution is ~1-2 px per day, so thinning long windows
+    # before Arrow serialization is invisible on the chart.
+    if len(df) > max_points:
+        return df.iloc[::len(df) // max_points]
+    return df
+
 # ----------------------------------------------------------
-# 4. Sidebar filters
+# 4. Chart data
 # ----------------------------------------------------------
-st.sidebar.header("📅 Date Filter")
 pv = clean_for_chart(portfolio_value)
-min_date, max_date = pv.index.min(), pv.index.max()
-start_date, end_date = st.sidebar.date_input(
-    "Select date range", [min_date, max_date], min_value=min_date, max_value=max_date
-)
-pv_filtered = pv.loc[str(start_date):str(end_date)]
+dd = clean_for_chart(drawdown)
+rs = clean_for_chart(rolling_sharpe)
 
 # ----------------------------------------------------------
 # 5. Key metrics
 # ----------------------------------------------------------
 st.header("📈 Key Portfolio Metrics")
 
-metrics = {row["Metric"]: row["Value"] for _, row in summary.iterrows()}
+metrics = dict(zip(summary["Metric"].to_numpy(), summary["Value"].to_numpy()))
 
 cols = st.columns(4)
 cols[0].metric("💰 Final Value", f"${metrics.get('Final Value', 0):,.0f}")
@@ -104,16 +122,29 @@ st.divider()
 # ----------------------------------------------------------
 # 6. Charts
 # ----------------------------------------------------------
-st.header("💼 Portfolio Value Over Time")
-st.line_chart(pv_filtered, y=pv_filtered.columns[0], width='stretch')
-
-st.header("📉 Maximum Drawdown")
-dd = clean_for_chart(drawdown)
-st.area_chart(dd, y=dd.columns[0], height=250, width='stretch')
-
-st.header("📊 Rolling Sharpe Ratio (90-day Window)")
-rs = clean_for_chart(rolling_sharpe)
-st.line_chart(rs, y=rs.columns[0], height=250, width='stretch')
+@st.fragment
+def render_charts(pv, dd, rs):
+    # The date filter lives inside the fragment, so moving it reruns
+    # only this section instead of the whole script.
+    st.sidebar.header("📅 Date Filter")
+    min_date, max_date = pv.index.min(), pv.index.max()
+    start_date, end_date = st.sidebar.date_input(
+        "Select date range", [min_date, max_date], min_value=min_date, max_value=max_date
+    )
+    pv_filtered = downsample(slice_dates(pv, start_date, end_date))
+    dd_filtered = downsample(slice_dates(dd, start_date, end_date))
+    rs_filtered = downsample(slice_dates(rs, start_date, end_date))
+
+    st.header("💼 Portfolio Value Over Time")
+    st.line_chart(pv_filtered, y=pv_filtered.columns[0], width='stretch')
+
+    st.header("📉 Maximum Drawdown")
+    st.area_chart(dd_filtered, y=dd_filtered.columns[0], height=250, width='stretch')
+
+    st.header("📊 Rolling Sharpe Ratio (90-day Window)")
+    st.line_chart(rs_filtered, y=rs_filtered.columns[0], height=250, width='stretch')
+
+render_charts(pv, dd, rs)
 
 # ----------------------------------------------------------
 # 7. Data explorer
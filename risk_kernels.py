@@ -0,0 +1,35 @@
+# ==========================================================
+# risk_kernels.py — Numba-compiled numeric kernels
+# ==========================================================
+# Kept in their own module so Numba's on-disk cache (__pycache__/*.nbi)
+# survives Streamlit reruns and reload() of the main engine module:
+# only the first-ever call pays the compile cost.
+import numpy as np
+from numba import njit
+
+@njit(cache=True, fastmath=True, nogil=True)
+def rolling_sharpe_kernel(r, window, rf_daily, ann):
+    """O(N) rolling Sharpe via running sum / sum-of-squares.
+
+    Maintains the window by adding the incoming element and subtracting
+    the outgoing one, instead of re-reducing the full window each step.
+    Uses the sample std (ddof=1) to match pandas' rolling().std().
+    """
+    n = r.shape[0]
+    out = np.full(n, np.nan)
+    s = 0.0
+    s2 = 0.0
+    for i in range(n):
+        x = r[i]
+        s += x
+        s2 += x * x
+        if i >= window:
+            y = r[i - window]
+            s -= y
+            s2 -= y * y
+        if i >= window - 1:
+            mean = s / window
+            var = (s2 - s * mean) / (window - 1)
+            if var > 0.0:
+                out[i] = (mean - rf_daily) / np.sqrt(var) * ann
+    return out